@@ -0,0 +1,101 @@
+"""Parameter sweep over the wrapper FMU using a pool of worker processes.
+
+Each worker owns one persistent, initialized FMU2Slave created in the pool
+initializer and stored on the task function, so nothing unpicklable ever
+crosses the process boundary. Between tasks the slave is recycled with
+fmi2Reset, which is far cheaper than a fresh instantiation.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# The shared extraction cache helper lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fmu_cache import cached_extract
+
+# --- Configuration ---
+WRAPPER_FMU_PATH = 'Amplifier_CPP_Wrapper.fmu'
+
+# Simulation parameters
+start_time = 0.0
+stop_time = 10.0
+step_size = 0.1
+
+# Gain values to sweep over
+GAINS = [0.5, 1.0, 2.0, 4.0, 8.0]
+
+
+def _init_worker(fmu_path):
+    """Create one persistent FMU slave for this worker process."""
+    from fmpy import read_model_description
+    from fmpy.fmi2 import FMU2Slave
+
+    model_description = read_model_description(fmu_path)
+    fmu = FMU2Slave(guid=model_description.guid,
+                    unzipDirectory=cached_extract(fmu_path),
+                    modelIdentifier=model_description.coSimulation.modelIdentifier,
+                    instanceName=f'sweep_worker_{os.getpid()}')
+    fmu.instantiate()
+    # Store the slave and value references on the task function itself; they
+    # live for the whole lifetime of the worker process
+    simulate_one.fmu = fmu
+    simulate_one.vrs = {v.name: v.valueReference for v in model_description.modelVariables}
+
+
+def simulate_one(gain):
+    """Run one simulation on the worker's persistent FMU; return (gain, max |y|)."""
+    import math
+
+    fmu = simulate_one.fmu
+    vrs = simulate_one.vrs
+    vr_u, vr_y, vr_k = vrs['u'], vrs['y'], vrs['k']
+
+    # Recycle the already-loaded instance instead of re-instantiating
+    fmu.reset()
+    fmu.setupExperiment(startTime=start_time, stopTime=stop_time)
+    fmu.enterInitializationMode()
+    # 'k' is a fixed parameter, so it must be set during initialization
+    fmu.setReal([vr_k], [gain])
+    fmu.exitInitializationMode()
+
+    # Integer step indexing avoids the floating-point drift of an
+    # accumulated sim_time, which can run the loop one extra iteration
+    y_max = 0.0
+    n_steps = int(round((stop_time - start_time) / step_size))
+    for i in range(n_steps):
+        sim_time = start_time + i * step_size
+        fmu.setReal([vr_u], [math.sin(sim_time * math.pi)])
+        fmu.doStep(currentCommunicationPoint=sim_time, communicationStepSize=step_size)
+        y = fmu.getReal([vr_y])[0]
+        if abs(y) > y_max:
+            y_max = abs(y)
+
+    return gain, y_max
+
+
+def main():
+    if not Path(WRAPPER_FMU_PATH).is_file():
+        print(f"Error: FMU '{WRAPPER_FMU_PATH}' not found. Please build it first.")
+        return
+
+    from multiprocessing import Pool
+
+    # Populate the extraction cache before the workers start so they all
+    # find a complete entry instead of racing to extract it
+    cached_extract(WRAPPER_FMU_PATH)
+
+    workers = min(os.cpu_count(), len(GAINS))
+    print(f"Sweeping gain over {GAINS} with {workers} workers...")
+
+    with Pool(processes=workers,
+              initializer=_init_worker,
+              initargs=(WRAPPER_FMU_PATH,)) as pool:
+        for gain, y_max in pool.map(simulate_one, GAINS):
+            print(f"  k = {gain:g}: max |y| = {y_max:.3f}")
+
+    print("Sweep finished.")
+
+
+if __name__ == "__main__":
+    main()
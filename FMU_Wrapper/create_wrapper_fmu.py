@@ -42,13 +42,17 @@ def build_wrapper():
     print(f"\nRunning command: {' '.join(build_command)}")
 
     # 3. Execute the build process
+    # Stream the build output line by line instead of buffering everything
+    # in memory until the child exits; progress is visible immediately.
     try:
-        result = subprocess.run(build_command, check=True, capture_output=True, text=True)
-        print("\n--- STDOUT ---")
-        print(result.stdout)
-        if result.stderr:
-            print("\n--- STDERR ---")
-            print(result.stderr)
+        proc = subprocess.Popen(build_command, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, text=True, bufsize=1)
+        print("\n--- Build Output ---")
+        for line in proc.stdout:
+            sys.stdout.write(line)
+        return_code = proc.wait()
+        if return_code != 0:
+            raise subprocess.CalledProcessError(return_code, build_command)
 
     except FileNotFoundError:
         print("\n--- Build Failed! ---")
@@ -59,10 +63,6 @@ def build_wrapper():
         print("\n--- Build Failed! ---")
         print("Error building the FMU with pythonfmu.")
         print(f"Return Code: {e.returncode}")
-        print("\n--- STDOUT ---")
-        print(e.stdout)
-        print("\n--- STDERR ---")
-        print(e.stderr)
         sys.exit(1)
 
     # 4. Rename the output file to our desired name
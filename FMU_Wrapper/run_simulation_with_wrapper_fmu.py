@@ -1,7 +1,9 @@
-from fmpy import simulate_fmu
-from fmpy.util import plot_result
-import os
-import numpy as np
+import sys
+from pathlib import Path
+
+# The shared extraction cache helper lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fmu_cache import cached_extract, finish_prewarm, prewarm
 
 # --- Configuration ---
 # UPDATED: Path to the wrapper for the new FMU
@@ -13,12 +15,24 @@ stop_time = 10.0
 step_size = 0.1
 
 # --- Main Simulation Script ---
-def main():
-    if not os.path.exists(WRAPPER_FMU_PATH):
+def main(no_plot=False, save=None):
+    # Overlap the heavy fmpy/numpy imports with the preamble work
+    prewarm()
+
+    if not Path(WRAPPER_FMU_PATH).is_file():
         print(f"Error: Wrapper FMU '{WRAPPER_FMU_PATH}' not found.")
         print("Please run 'python create_wrapper_fmu.py' first to build it.")
         return
 
+    # Defer the heavy fmpy/numpy imports until after the file check so the
+    # error path does not pay their import cost; wait for the prewarm
+    # thread first so no module is imported from two threads at once
+    finish_prewarm()
+    from fmpy import simulate_fmu
+    import numpy as np
+    from signal_gen import sine_signal
+    from plot_utils import emit_plot
+
     print(f"Simulating wrapper FMU: {WRAPPER_FMU_PATH}")
     
     # --- FIX FOR TypeError ---
@@ -26,15 +40,19 @@ def main():
     # to correctly map signal columns to the FMU's input variables.
 
     # 1. Define the time vector and signal values
-    time = np.arange(start_time, stop_time, step_size)
-    u_signal = np.sin(time * np.pi)
+    # linspace with an explicit count avoids the off-by-one sample that
+    # np.arange can produce from accumulated floating-point error
+    n_steps = int(round((stop_time - start_time) / step_size))
+    time = np.linspace(start_time, stop_time, n_steps, endpoint=False)
+    u_signal = sine_signal(time)
 
     # 2. Define the data type for the structured array
     # The field names ('time', 'u') must match the FMU's variable names.
     input_dtype = np.dtype([('time', np.double), ('u', np.double)])
     
-    # 3. Create the structured array
-    input_signal = np.zeros(len(time), dtype=input_dtype)
+    # 3. Create the structured array (np.empty avoids zero-filling a buffer
+    # that is fully overwritten by the field assignments below)
+    input_signal = np.empty(len(time), dtype=input_dtype)
     input_signal['time'] = time
     input_signal['u'] = u_signal
     
@@ -44,8 +62,10 @@ def main():
     output = ['u', 'y']
 
     # Use fmpy's high-level simulate_fmu function.
+    # simulate_fmu accepts an extracted directory, so reuse the shared
+    # content-addressed extraction instead of unzipping on every run
     result = simulate_fmu(
-        WRAPPER_FMU_PATH,
+        cached_extract(WRAPPER_FMU_PATH),
         start_time=start_time,
         stop_time=stop_time,
         step_size=step_size,
@@ -56,9 +76,16 @@ def main():
     print("Simulation finished.")
 
     # Plot results to observe the effect of the faults
-    plot_result(result,
-                window_title=f"Simulation of {WRAPPER_FMU_PATH}",
-                events=True)
+    emit_plot(result, f"Simulation of {WRAPPER_FMU_PATH}", no_plot, save,
+              events=True)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulate the fault-wrapper FMU with a sine input.")
+    parser.add_argument('--no-plot', action='store_true',
+                        help='skip plotting entirely (batch/CI runs)')
+    parser.add_argument('--save', metavar='PNG',
+                        help='render headlessly and save the plot to this file '
+                             'instead of showing a window')
+    args = parser.parse_args()
+    main(no_plot=args.no_plot, save=args.save)
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""Content-addressed cache for extracted FMUs.
+
+Unzipping an FMU on every run rewrites the same shared libraries and
+resources to a fresh temp directory. cached_extract() keys the extracted
+tree by the SHA-256 of the FMU file under ~/.cache/fmpy/, so repeated runs
+(and different scripts driving the same FMU) reuse a single extraction.
+Only stdlib is imported at module load; fmpy is pulled in lazily on a
+cache miss.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+
+def cached_extract(fmu_path):
+    """Extract fmu_path once and reuse the extracted tree on later calls.
+
+    Returns the extracted directory as a string, suitable either as the
+    unzipDirectory of an FMU2Slave or as the filename argument of
+    simulate_fmu(), which accepts an already-extracted directory.
+
+    Setting the FMU_UNZIP_DIR environment variable overrides the cache
+    root, so several scripts run in the same session (simulate_fmu
+    drivers and the manual stepping loop alike) can share one extraction
+    tree. Entries are still keyed per digest below the override, so
+    scripts driving different FMUs never alias to the same directory.
+    """
+    with open(fmu_path, 'rb') as f:
+        digest = hashlib.file_digest(f, 'sha256').hexdigest()
+    override = os.environ.get('FMU_UNZIP_DIR')
+    if override:
+        cache_dir = Path(override) / digest
+    else:
+        cache_dir = Path.home() / '.cache' / 'fmpy' / digest
+    # Check for modelDescription.xml rather than the bare directory so a
+    # partially written cache entry is re-extracted
+    if not (cache_dir / 'modelDescription.xml').is_file():
+        from fmpy import extract
+
+        # Extract into a temp sibling and publish it with an atomic rename,
+        # so concurrent callers (e.g. pool workers on a cold cache) never
+        # observe a half-written entry
+        tmp_dir = cache_dir.parent / f'{cache_dir.name}.tmp-{os.getpid()}'
+        extract(fmu_path, unzipdir=str(tmp_dir))
+        try:
+            os.rename(tmp_dir, cache_dir)
+        except OSError:
+            # Another process won the race and published the entry first
+            import shutil
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return str(cache_dir)
+
+
+_prewarm_thread = None
+
+
+def prewarm():
+    """Start a daemon thread that front-loads the heavy imports.
+
+    Call this at the top of main(), before the FMU existence check and
+    argument handling: by the time the simulation actually needs
+    fmpy/numpy (and Numba's dispatcher, when installed) the modules are
+    already imported. The thread is a daemon, so early-returning error
+    paths never wait on it. The happy path must call finish_prewarm()
+    before importing the heavy modules itself.
+    """
+    global _prewarm_thread
+    import threading
+
+    def _import_heavy():
+        import numpy   # noqa: F401
+        import fmpy    # noqa: F401
+        try:
+            import numba
+            # A trivial compile warms the dispatcher machinery
+            numba.njit(cache=True)(lambda x: x + 1.0)(0.0)
+        except ImportError:
+            pass
+
+    _prewarm_thread = threading.Thread(target=_import_heavy, daemon=True)
+    _prewarm_thread.start()
+
+
+def finish_prewarm():
+    """Wait for the prewarm thread before importing the heavy modules.
+
+    Importing numpy concurrently from two threads can observe a partially
+    initialized module, so the scripts join the warm-up thread right
+    before their own deferred imports; those then resolve straight from
+    sys.modules.
+    """
+    if _prewarm_thread is not None:
+        _prewarm_thread.join()
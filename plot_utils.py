@@ -0,0 +1,30 @@
+"""Shared plotting helper for the run scripts.
+
+Only stdlib is imported at module load; matplotlib and fmpy's plotting are
+pulled in lazily inside emit_plot(), so importing this module keeps the
+scripts' fast error path intact.
+"""
+
+
+def emit_plot(result, window_title, no_plot=False, save=None, events=False):
+    """Plot interactively, save headlessly off the critical path, or skip."""
+    if no_plot:
+        return
+    if save:
+        # Render on a worker thread so code following the simulation is not
+        # blocked on the PNG write; plot_result saves headlessly by itself
+        from concurrent.futures import ThreadPoolExecutor
+        from fmpy.util import plot_result
+
+        def _report(future):
+            # surface failures that would otherwise vanish with the future
+            error = future.exception()
+            if error is not None:
+                print(f"Error: could not save plot to '{save}': {error}")
+
+        ThreadPoolExecutor(max_workers=1).submit(
+            plot_result, result, filename=save, events=events
+        ).add_done_callback(_report)
+    else:
+        from fmpy.util import plot_result
+        plot_result(result, window_title=window_title, events=events)